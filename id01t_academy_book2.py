@@ -14,8 +14,9 @@ Version: 1.5.2.0
 """
 
 import os, sys, json, subprocess, importlib, datetime, csv, zipfile, webbrowser, traceback, random
+import threading, queue, time, hashlib, hmac, secrets, base64, bisect, itertools
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # --------------------------- dependency bootstrap ----------------------------
 REQUIRED = [
@@ -48,7 +49,7 @@ _ensure_deps()
 
 # ------------------------------ safe imports ---------------------------------
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog
 
 try:
     import ttkbootstrap as tb
@@ -131,6 +132,31 @@ def safe_save_json(path: Path, data: Any) -> bool:
         messagebox.showerror("Save failed", f"Could not save {path.name}\n{e}")
         return False
 
+def run_in_background(widget: tk.Misc, work: Callable[[], Any], on_done: Callable[[Any], None],
+                      on_error: Optional[Callable[[Exception], None]] = None, poll_ms: int = 50) -> None:
+    # work runs on a daemon thread and must not touch Tk, callbacks run on the Tk thread
+    box: "queue.Queue" = queue.Queue(maxsize=1)
+    def runner():
+        try:
+            box.put((True, work()))
+        except Exception as e:
+            traceback.print_exc()
+            box.put((False, e))
+    def poll():
+        try:
+            ok, value = box.get_nowait()
+        except queue.Empty:
+            widget.after(poll_ms, poll)
+            return
+        if ok:
+            on_done(value)
+        elif on_error:
+            on_error(value)
+        else:
+            messagebox.showerror("Background task failed", str(value))
+    threading.Thread(target=runner, daemon=True).start()
+    widget.after(poll_ms, poll)
+
 def export_zip_all() -> None:
     fp = filedialog.asksaveasfilename(
         title="Export all data",
@@ -314,43 +340,238 @@ class MiniAdventure(ttk.Frame):
             else: self.write("Following the river leads you home. The end."); self.state = 0
 
 class PasswordVault(ttk.Frame):
-    FILE = DATA_DIR / "passwords.json"
+    FILE = DATA_DIR / "vault.jsonl"
+    META = DATA_DIR / "vault_meta.json"
+    LEGACY = DATA_DIR / "passwords.json"
+    SCRYPT = {"n": 2 ** 15, "r": 8, "p": 1}
+    SESSION_SECONDS = 300
     def __init__(self, master):
         super().__init__(master, padding=10)
-        self.data: Dict[str, str] = safe_load_json(self.FILE, {})
-        section(self, "Password Vault", "Educational example, not for real secrets")
+        # append-only log, one sealed entry per line, the last line for a site wins
+        self.data: Dict[str, Dict[str, str]] = self._load_log()
+        self.key: Optional[bytes] = None
+        self.last_use = 0.0; self.busy = False; self._watch_id = None
+        section(self, "Password Vault", "Master password, scrypt key, authenticated encryption per entry")
         grid = ttk.Frame(self); grid.pack(pady=6)
-        self.site = tk.StringVar(); self.pw = tk.StringVar()
-        ttk.Label(grid, text="Site").grid(row=0, column=0, sticky="w")
-        ttk.Entry(grid, textvariable=self.site, width=24).grid(row=0, column=1, padx=6)
-        ttk.Label(grid, text="Password").grid(row=1, column=0, sticky="w")
-        ttk.Entry(grid, textvariable=self.pw, width=24, show="*").grid(row=1, column=1, padx=6)
-        ttk.Button(grid, text="Save", command=self.save_pw, style="Accent.TButton").grid(row=2, column=0, pady=6)
-        ttk.Button(grid, text="Show", command=self.show_pw).grid(row=2, column=1, pady=6)
+        self.master_pw = tk.StringVar(); self.site = tk.StringVar(); self.pw = tk.StringVar()
+        ttk.Label(grid, text="Master").grid(row=0, column=0, sticky="w")
+        ttk.Entry(grid, textvariable=self.master_pw, width=24, show="*").grid(row=0, column=1, padx=6)
+        self.lock_btn = ttk.Button(grid, text="Unlock", command=self.toggle_lock, style="Accent.TButton")
+        self.lock_btn.grid(row=0, column=2, padx=6)
+        ttk.Label(grid, text="Site").grid(row=1, column=0, sticky="w")
+        ttk.Entry(grid, textvariable=self.site, width=24).grid(row=1, column=1, padx=6)
+        ttk.Label(grid, text="Password").grid(row=2, column=0, sticky="w")
+        ttk.Entry(grid, textvariable=self.pw, width=24, show="*").grid(row=2, column=1, padx=6)
+        ttk.Button(grid, text="Save", command=self.save_pw, style="Accent.TButton").grid(row=3, column=0, pady=6)
+        ttk.Button(grid, text="Show", command=self.show_pw).grid(row=3, column=1, pady=6)
         self.list = tk.Listbox(self, height=8); self.list.pack(fill="x")
-        ttk.Label(self, text="This is a demo, use a real password manager for production").pack(anchor="w", pady=(4, 0))
-        ttk.Button(self, text="View Tab Code", command=lambda: view_source(self, PasswordVault)).pack(anchor="e", pady=6)
+        self.status = ttk.Label(self, text="Locked"); self.status.pack(anchor="w", pady=(4, 0))
+        bar = ttk.Frame(self); bar.pack(fill="x", pady=6)
+        ttk.Button(bar, text="Import CSV", command=self.import_csv).pack(side="left")
+        ttk.Button(bar, text="Export CSV", command=self.export_csv).pack(side="left", padx=6)
+        ttk.Button(bar, text="View Tab Code", command=lambda: view_source(self, PasswordVault)).pack(side="right")
         self.refresh_list()
+    # ---- crypto, pure functions so they can run on a worker thread
+    @staticmethod
+    def _b64(b: bytes) -> str:
+        return base64.b64encode(b).decode("ascii")
+    @staticmethod
+    def _unb64(s: str) -> bytes:
+        return base64.b64decode(s.encode("ascii"))
+    @staticmethod
+    def _derive(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+        # 64 bytes, first half encrypts, second half authenticates
+        return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=2 ** 26, dklen=64)
+    @staticmethod
+    def _check(key: bytes) -> bytes:
+        return hmac.new(key[32:], b"iD01t vault check", hashlib.sha256).digest()
     @staticmethod
-    def _enc(s: str, k: int = 3) -> str:
-        return "".join(chr((ord(ch) + k) % 65535) for ch in s)
+    def _xor(data: bytes, key: bytes, nonce: bytes) -> bytes:
+        stream = hashlib.shake_256(key[:32] + nonce).digest(len(data))
+        return (int.from_bytes(data, "big") ^ int.from_bytes(stream, "big")).to_bytes(len(data), "big")
     @staticmethod
-    def _dec(s: str, k: int = 3) -> str:
+    def _tag(key: bytes, site: str, nonce: bytes, ct: bytes) -> bytes:
+        # the site name is authenticated too, length prefixed so no other split of the bytes matches
+        raw = site.encode("utf-8")
+        return hmac.new(key[32:], len(raw).to_bytes(4, "big") + raw + nonce + ct, hashlib.sha256).digest()
+    @classmethod
+    def _seal(cls, key: bytes, site: str, secret: str) -> Dict[str, str]:
+        nonce = secrets.token_bytes(16)
+        ct = cls._xor(secret.encode("utf-8"), key, nonce)
+        return {"s": site, "n": cls._b64(nonce), "c": cls._b64(ct), "t": cls._b64(cls._tag(key, site, nonce, ct))}
+    @classmethod
+    def _open(cls, key: bytes, rec: Dict[str, str]) -> str:
+        nonce, ct = cls._unb64(rec["n"]), cls._unb64(rec["c"])
+        if not hmac.compare_digest(cls._tag(key, rec["s"], nonce, ct), cls._unb64(rec["t"])):
+            raise ValueError(f"Entry for {rec['s']} failed authentication")
+        return cls._xor(ct, key, nonce).decode("utf-8")
+    @staticmethod
+    def _legacy_dec(s: str, k: int = 3) -> str:
+        # shift cipher used by passwords.json before 1.6, only read for migration
         return "".join(chr((ord(ch) - k) % 65535) for ch in s)
+    # ---- storage
+    def _load_log(self) -> Dict[str, Dict[str, str]]:
+        data: Dict[str, Dict[str, str]] = {}; lines = 0
+        try:
+            if self.FILE.exists():
+                with open(self.FILE, encoding="utf-8") as f:
+                    for line in f:
+                        if not line.strip(): continue
+                        lines += 1
+                        try:
+                            rec = json.loads(line)
+                            if isinstance(rec, dict): data[str(rec["s"])] = rec
+                        except (ValueError, KeyError, TypeError):
+                            continue  # torn or foreign line, skip it and keep the rest
+        except Exception:
+            traceback.print_exc()
+            return data  # partial load, never compact from it
+        if lines > 2 * len(data) + 64:
+            self._compact(data)
+        return data
+    def _compact(self, data: Dict[str, Dict[str, str]]) -> None:
+        tmp = self.FILE.with_suffix(".tmp")
+        try:
+            tmp.write_text("".join(json.dumps(r) + "\n" for r in data.values()), encoding="utf-8")
+            os.replace(tmp, self.FILE)
+        except Exception:
+            traceback.print_exc()
+    def _append(self, recs: List[Dict[str, str]]) -> bool:
+        try:
+            # an interrupted write may have left the last line without its newline
+            torn = False
+            if self.FILE.exists() and self.FILE.stat().st_size:
+                with open(self.FILE, "rb") as f:
+                    f.seek(-1, os.SEEK_END); torn = f.read(1) != b"\n"
+            with open(self.FILE, "a", encoding="utf-8") as f:
+                if torn: f.write("\n")
+                f.write("".join(json.dumps(r) + "\n" for r in recs))
+        except Exception as e:
+            messagebox.showerror("Save failed", f"Could not save {self.FILE.name}\n{e}")
+            return False
+        for r in recs: self.data[r["s"]] = r
+        return True
+    # ---- session
+    def _set_busy(self, text: str) -> None:
+        self.busy = True; self.status.config(text=text)
+    def _idle(self, text: str = "") -> None:
+        self.busy = False
+        self.status.config(text=text or (f"Unlocked, locks after {self.SESSION_SECONDS // 60} min idle" if self.key else "Locked"))
+    def _failed(self, e: Exception) -> None:
+        self._idle(); messagebox.showerror("Vault", str(e))
+    def _require_key(self) -> bool:
+        if self.key is None:
+            messagebox.showerror("Locked", "Unlock the vault with the master password first")
+            return False
+        self.last_use = time.monotonic()
+        return True
+    def _watch(self):
+        if self.busy:
+            self.last_use = time.monotonic()  # an import or export still holds the key
+        elif self.key is not None and time.monotonic() - self.last_use > self.SESSION_SECONDS:
+            self.lock(); return
+        self._watch_id = self.after(5000, self._watch)
+    def toggle_lock(self):
+        if self.busy: return
+        if self.key is not None:
+            self.lock(); return
+        pw = self.master_pw.get()
+        if not pw:
+            messagebox.showerror("Missing", "Enter the master password"); return
+        meta = safe_load_json(self.META, None)
+        if meta is None and self.data:
+            messagebox.showerror("Vault", f"{self.META.name} is missing, entries cannot be decrypted"); return
+        if meta is None:
+            again = simpledialog.askstring("New vault", "Confirm the new master password", show="*", parent=self)
+            if again is None: return
+            if again != pw:
+                messagebox.showerror("Mismatch", "The passwords do not match, the vault was not created"); return
+        # migrate once, never over entries already in the vault
+        legacy: Dict[str, str] = {}
+        if meta is None or not meta.get("migrated", True):
+            legacy = {k: v for k, v in safe_load_json(self.LEGACY, {}).items() if k not in self.data}
+        params = dict(self.SCRYPT)
+        def work():
+            if meta is None:
+                salt = secrets.token_bytes(16)
+                key = self._derive(pw, salt, **params)
+                new_meta = {"salt": self._b64(salt), **params, "check": self._b64(self._check(key)), "migrated": not legacy}
+            else:
+                key = self._derive(pw, self._unb64(meta["salt"]), meta["n"], meta["r"], meta["p"])
+                if not hmac.compare_digest(self._check(key), self._unb64(meta["check"])):
+                    raise ValueError("Wrong master password")
+                new_meta = dict(meta)
+            migrated = [self._seal(key, site, self._legacy_dec(v)) for site, v in legacy.items()]
+            return key, new_meta, migrated
+        self._set_busy("Deriving key...")
+        run_in_background(self, work, self._unlocked, self._failed)
+    def _unlocked(self, result):
+        key, meta, migrated = result
+        if not self.META.exists() and not safe_save_json(self.META, meta):
+            self._idle(); return
+        self.key = key; self.last_use = time.monotonic(); self.master_pw.set("")
+        self.lock_btn.config(text="Lock")
+        if migrated and self._append(migrated):
+            meta["migrated"] = True; safe_save_json(self.META, meta)
+            try:
+                self.LEGACY.unlink()  # shift cipher only, keeping it would leak every migrated secret
+            except OSError:
+                traceback.print_exc()
+        self._idle(); self.refresh_list(); self._watch()
+    def lock(self):
+        self.key = None
+        if self._watch_id is not None:
+            self.after_cancel(self._watch_id); self._watch_id = None
+        # leave the busy flag to the running task, its done or _failed callback clears it
+        self.lock_btn.config(text="Unlock"); self.status.config(text="Locked")
     def save_pw(self):
+        if not self._require_key(): return
         site = self.site.get().strip(); pw = self.pw.get()
         if not site or not pw:
             messagebox.showerror("Missing", "Fill both fields")
             return
-        self.data[site] = self._enc(pw)
-        safe_save_json(self.FILE, self.data)
-        self.pw.set("")
-        self.refresh_list()
+        if self._append([self._seal(self.key, site, pw)]):
+            self.pw.set("")
+            self.refresh_list()
     def show_pw(self):
         sel = self.list.curselection()
-        if not sel: return
+        if not sel or not self._require_key(): return
         site = self.list.get(sel[0])
-        messagebox.showinfo("Password", f"{site}: {self._dec(self.data.get(site, '?'))}")
+        try:
+            messagebox.showinfo("Password", f"{site}: {self._open(self.key, self.data[site])}")
+        except Exception as e:
+            messagebox.showerror("Vault", str(e))
+    def import_csv(self):
+        if self.busy or not self._require_key(): return
+        fp = filedialog.askopenfilename(title="Import CSV", filetypes=[("CSV", "*.csv")])
+        if not fp: return
+        key = self.key
+        def work():
+            recs = []
+            with open(fp, newline="", encoding="utf-8") as f:
+                for row in csv.reader(f):
+                    if len(row) < 2 or not row[0].strip() or [c.lower() for c in row[:2]] == ["site", "password"]:
+                        continue
+                    recs.append(self._seal(key, row[0].strip(), row[1]))
+            return recs
+        def done(recs):
+            ok = self._append(recs)
+            self._idle(f"Imported {len(recs)} entries" if ok else ""); self.refresh_list()
+        self._set_busy("Importing...")
+        run_in_background(self, work, done, self._failed)
+    def export_csv(self):
+        if self.busy or not self._require_key(): return
+        if not messagebox.askyesno("Export", "The CSV will contain plain text passwords. Continue?"): return
+        fp = filedialog.asksaveasfilename(title="Export CSV", defaultextension=".csv", initialfile="passwords.csv")
+        if not fp: return
+        key = self.key; snapshot = list(self.data.values())
+        def work():
+            with open(fp, "w", newline="", encoding="utf-8") as f:
+                w = csv.writer(f); w.writerow(["site", "password"])
+                for rec in snapshot: w.writerow([rec["s"], self._open(key, rec)])
+            return len(snapshot)
+        self._set_busy("Exporting...")
+        run_in_background(self, work, lambda n: self._idle(f"Exported {n} entries"), self._failed)
     def refresh_list(self):
         self.list.delete(0, "end")
         for s in sorted(self.data.keys()):
@@ -437,41 +658,211 @@ class UnitConverter(ttk.Frame):
         except Exception:
             self.out.set("Invalid")
 
+class QuestionBank:
+    # offset index over JSON Lines and CSV files, one question per line, read from disk on demand
+    ANY = "Any"
+    INDEX_VERSION = 1  # bump whenever _parse accepts or rejects rows differently
+    def __init__(self):
+        self.groups: Dict[Tuple[str, str], List[Tuple[Path, List[int]]]] = {}
+        self.headers: Dict[Path, List[str]] = {}
+    @classmethod
+    def open(cls, paths: List[Path]) -> "QuestionBank":
+        bank = cls()
+        for path in paths:
+            try:
+                idx = cls._index(path)
+            except Exception:
+                traceback.print_exc(); continue
+            bank.headers[path] = idx["header"]
+            for topic, difficulty, offsets in idx["groups"]:
+                bank.groups.setdefault((topic, difficulty), []).append((path, offsets))
+        return bank
+    @staticmethod
+    def _parse(header: List[str], line: bytes) -> Dict[str, Any]:
+        text = line.decode("utf-8-sig")
+        if header:
+            cells = next(csv.reader([text]))
+            raw: Dict[str, Any] = dict(zip(header, cells))
+            # keep header positions so answer still indexes the right column, only drop trailing blanks
+            opts = [v for k, v in zip(header, cells) if k.startswith("option")]
+            while opts and not opts[-1].strip(): opts.pop()
+            raw["options"] = opts
+        else:
+            raw = json.loads(text)
+        q = str(raw.get("question") or raw["q"])
+        rec = {
+            "q": q,
+            "options": [str(o) for o in raw["options"]],
+            "answer": int(raw["answer"]),
+            "topic": str(raw.get("topic") or "General"),
+            "difficulty": str(raw.get("difficulty") or "Normal"),
+            "id": str(raw.get("id") or hashlib.blake2b(q.encode("utf-8"), digest_size=6).hexdigest()),
+        }
+        blank = [i for i, o in enumerate(rec["options"]) if not o.strip()]
+        if blank:
+            raise ValueError(f"blank option {blank[0] + 1}, fill every option up to the last one")
+        if not 0 <= rec["answer"] < len(rec["options"]):
+            raise ValueError(f"answer out of range: {q}")
+        return rec
+    @classmethod
+    def _index(cls, path: Path) -> Dict[str, Any]:
+        # cached next to the bank, rebuilt only when the file changes
+        cache = path.with_name(path.name + ".idx")
+        st = path.stat()
+        idx = safe_load_json(cache, None)
+        if (isinstance(idx, dict) and idx.get("v") == cls.INDEX_VERSION
+                and idx.get("size") == st.st_size and idx.get("mtime") == st.st_mtime_ns):
+            try:
+                return {"header": [str(h) for h in idx["header"]],
+                        "groups": [[str(t), str(d), [int(o) for o in offs]] for t, d, offs in idx["groups"]]}
+            except (KeyError, TypeError, ValueError):
+                pass  # damaged cache, rebuild it below
+        header: List[str] = []
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        bad = 0
+        with open(path, "rb") as f:
+            off = 0; lineno = 0
+            if path.suffix.lower() == ".csv":
+                first = f.readline(); off = len(first); lineno = 1
+                header = [h.strip().lower() for h in next(csv.reader([first.decode("utf-8-sig")]), [])]
+            for line in f:
+                lineno += 1
+                if line.strip():
+                    try:
+                        rec = cls._parse(header, line)
+                        groups.setdefault((rec["topic"], rec["difficulty"]), []).append(off)
+                    except Exception as e:
+                        bad += 1
+                        if bad <= 5: print(f"[warn] {path.name} line {lineno}: skipped, {e}")
+                off += len(line)
+        if bad > 5:
+            print(f"[warn] {path.name}: {bad} malformed rows skipped in total")
+        idx = {"v": cls.INDEX_VERSION, "size": st.st_size, "mtime": st.st_mtime_ns, "header": header,
+               "groups": [[t, d, offs] for (t, d), offs in groups.items()]}
+        try:
+            cache.write_text(json.dumps(idx, separators=(",", ":")), encoding="utf-8")
+        except Exception:
+            traceback.print_exc()
+        return idx
+    def topics(self) -> List[str]:
+        return sorted({t for t, _ in self.groups})
+    def difficulties(self) -> List[str]:
+        return sorted({d for _, d in self.groups})
+    def sample(self, topic: str, difficulty: str, k: int) -> List[Tuple[Path, int]]:
+        # random.sample over a range picks k positions without materializing or shuffling the pool
+        chunks = [c for (t, d), cs in self.groups.items()
+                  if topic in (self.ANY, t) and difficulty in (self.ANY, d) for c in cs]
+        ends = list(itertools.accumulate(len(offs) for _, offs in chunks))
+        total = ends[-1] if ends else 0
+        picks = []
+        for i in random.sample(range(total), min(k, total)):
+            c = bisect.bisect_right(ends, i)
+            path, offs = chunks[c]
+            picks.append((path, offs[i - (ends[c - 1] if c else 0)]))
+        return picks
+    def load(self, path: Path, offset: int) -> Dict[str, Any]:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return self._parse(self.headers[path], f.readline())
+
 class QuizGame(ttk.Frame):
+    STATS = DATA_DIR / "quiz_stats.csv"
+    ROUND = 10
+    # written to data/quiz_bank.jsonl on first run, add quiz_bank*.jsonl or quiz_bank*.csv files for more
+    SEED = [
+        ("Which keyword defines a function in Python?", ["def", "fun", "func"], 0),
+        ("What does len([1,2,3]) return?", ["2", "3", "4"], 1),
+        ("Which type is immutable?", ["list", "dict", "tuple"], 2),
+        ("What opens a file for reading text?", ["open(path,'r')", "read(path)", "file.read()"], 0),
+        ("Which library plots charts?", ["matplotlib", "bs4", "ttkbootstrap"], 0),
+    ]
     def __init__(self, master):
         super().__init__(master, padding=10)
-        section(self, "Quiz", "Five quick questions")
-        self.qs = [
-            ("Which keyword defines a function in Python?", ["def", "fun", "func"], 0),
-            ("What does len([1,2,3]) return?", ["2", "3", "4"], 1),
-            ("Which type is immutable?", ["list", "dict", "tuple"], 2),
-            ("What opens a file for reading text?", ["open(path,'r')", "read(path)", "file.read()"], 0),
-            ("Which library plots charts?", ["matplotlib", "bs4", "ttkbootstrap"], 0),
-        ]
+        section(self, "Quiz", "Random rounds from the question bank in ./data")
+        row = ttk.Frame(self); row.pack(fill="x", pady=6)
+        self.topic = tk.StringVar(value=QuestionBank.ANY); self.level = tk.StringVar(value=QuestionBank.ANY)
+        ttk.Label(row, text="Topic").pack(side="left")
+        self.topic_box = ttk.Combobox(row, textvariable=self.topic, values=[QuestionBank.ANY], width=18, state="readonly")
+        self.topic_box.pack(side="left", padx=6)
+        ttk.Label(row, text="Difficulty").pack(side="left")
+        self.level_box = ttk.Combobox(row, textvariable=self.level, values=[QuestionBank.ANY], width=12, state="readonly")
+        self.level_box.pack(side="left", padx=6)
+        ttk.Button(row, text="New quiz", command=self.new_quiz).pack(side="left")
+        self.bank: Optional[QuestionBank] = None
+        self.stats: Dict[str, List[int]] = {}
+        self.round: List[Tuple[Path, int]] = []; self.current: Optional[Dict[str, Any]] = None
         self.idx = 0; self.score = 0
-        self.qvar = tk.StringVar(); self.sel = tk.IntVar(value=-1)
+        self.qvar = tk.StringVar(value="Loading question bank..."); self.sel = tk.IntVar(value=-1)
         ttk.Label(self, textvariable=self.qvar, wraplength=700).pack(anchor="w", pady=6)
-        self.opts = []
-        for i in range(3):
-            rb = ttk.Radiobutton(self, text="", value=i, variable=self.sel)
-            rb.pack(anchor="w"); self.opts.append(rb)
+        self.opts_frame = ttk.Frame(self); self.opts_frame.pack(fill="x")
+        self.opts: List[ttk.Radiobutton] = []
         bar = ttk.Frame(self); bar.pack(fill="x", pady=6)
         ttk.Button(bar, text="Submit", command=self.submit, style="Accent.TButton").pack(side="left")
         self.status = ttk.Label(bar, text="Score: 0/0"); self.status.pack(side="left", padx=12)
         ttk.Button(bar, text="View Tab Code", command=lambda: view_source(self, QuizGame)).pack(side="right")
+        run_in_background(self, self._open_bank, self._bank_ready)
+    def _open_bank(self):
+        # worker thread, indexing and stats aggregation never block the UI
+        paths = sorted(DATA_DIR.glob("quiz_bank*.jsonl")) + sorted(DATA_DIR.glob("quiz_bank*.csv"))
+        if not paths:
+            seed = DATA_DIR / "quiz_bank.jsonl"
+            seed.write_text("".join(json.dumps({"q": q, "options": o, "answer": a, "topic": "Python", "difficulty": "Easy"}) + "\n"
+                                    for q, o, a in self.SEED), encoding="utf-8")
+            paths = [seed]
+        stats: Dict[str, List[int]] = {}
+        if self.STATS.exists():
+            with open(self.STATS, newline="", encoding="utf-8") as f:
+                for row in csv.reader(f):
+                    if len(row) < 2: continue
+                    s = stats.setdefault(row[0], [0, 0]); s[0] += 1; s[1] += row[1] == "1"
+        return QuestionBank.open(paths), stats
+    def _bank_ready(self, result):
+        self.bank, self.stats = result
+        self.topic_box.config(values=[QuestionBank.ANY] + self.bank.topics())
+        self.level_box.config(values=[QuestionBank.ANY] + self.bank.difficulties())
+        self.new_quiz()
+    def new_quiz(self):
+        if self.bank is None: return
+        self.round = self.bank.sample(self.topic.get(), self.level.get(), self.ROUND)
+        self.idx = 0; self.score = 0
+        if not self.round:
+            self.current = None; self.qvar.set("No questions match this topic and difficulty")
+            self._show_options([]); self.status.config(text="Score: 0/0")
+            return
         self.load_q()
+    def _show_options(self, options: List[str]):
+        while len(self.opts) < len(options):
+            self.opts.append(ttk.Radiobutton(self.opts_frame, text="", value=len(self.opts), variable=self.sel))
+        for i, rb in enumerate(self.opts):
+            if i < len(options): rb.config(text=options[i]); rb.pack(anchor="w")
+            else: rb.pack_forget()
     def load_q(self):
-        if self.idx >= len(self.qs):
-            messagebox.showinfo("Quiz done", f"Final score {self.score}/{len(self.qs)}")
-            self.idx = 0; self.score = 0
-        q, ans, _ = self.qs[self.idx]
-        self.qvar.set(q)
-        for i, rb in enumerate(self.opts): rb.config(text=ans[i])
-        self.sel.set(-1); self.status.config(text=f"Score: {self.score}/{self.idx}")
+        if self.idx >= len(self.round):
+            messagebox.showinfo("Quiz done", f"Final score {self.score}/{len(self.round)}")
+            self.new_quiz(); return
+        try:
+            self.current = self.bank.load(*self.round[self.idx])
+        except Exception as e:
+            traceback.print_exc()
+            self.current = None; self._show_options([])
+            self.qvar.set(f"Could not read question, the bank may have changed. Press New quiz.\n{e}")
+            return
+        self.qvar.set(self.current["q"]); self._show_options(self.current["options"])
+        seen, right = self.stats.get(self.current["id"], [0, 0])
+        hist = f"  ·  this question {right}/{seen} before" if seen else ""
+        self.sel.set(-1); self.status.config(text=f"Score: {self.score}/{self.idx}{hist}")
+    def _record(self, qid: str, ok: bool) -> None:
+        s = self.stats.setdefault(qid, [0, 0]); s[0] += 1; s[1] += ok
+        try:
+            with open(self.STATS, "a", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow([qid, int(ok), int(time.time())])
+        except Exception:
+            traceback.print_exc()
     def submit(self):
-        if self.sel.get() == -1: return
-        correct = self.qs[self.idx][2]
-        if self.sel.get() == correct: self.score += 1
+        if self.current is None or self.sel.get() == -1: return
+        ok = self.sel.get() == self.current["answer"]
+        if ok: self.score += 1
+        self._record(self.current["id"], ok)
         self.idx += 1; self.load_q()
 
 class WeatherMini(ttk.Frame):